@@ -0,0 +1,218 @@
+# Generated by scripts/bake_styles.py from art_styles.json; do not edit.
+ART_STYLES = (
+    'Abstract art',
+    'Abstract expressionism',
+    'Abstract illusionism',
+    'Academic art',
+    'Action painting',
+    'Aestheticism',
+    'Afrofuturism',
+    'Altermodern',
+    'American Barbizon school',
+    'American Impressionism',
+    'American realism',
+    'American Scene Painting',
+    'Analytical art',
+    'Animation',
+    'Antipodeans',
+    'Arabesque',
+    'Arbeitsrat für Kunst',
+    'Art & Language',
+    'Art Brut',
+    'Art Deco',
+    'Art Informel',
+    'Art Nouveau',
+    'Art photography',
+    'Arte Povera',
+    'Artificial intelligence art',
+    'Arts and Crafts movement',
+    'ASCII art',
+    'Ashcan School',
+    'Assemblage',
+    'Australian Tonalism',
+    'Les Automatistes',
+    'Auto-destructive art',
+    'Avant-garde',
+    'Bacone school',
+    'Barbizon school',
+    'Baroque',
+    'Bauhaus',
+    'Bengal School of Art',
+    'Berlin Secession',
+    'Black Arts Movement',
+    'Brutalism',
+    'Cave painting',
+    'Classical Realism',
+    'Cloisonnism',
+    'COBRA',
+    'Color Field',
+    'Computer art',
+    'Conceptual art',
+    'Concrete art',
+    'Constructivism',
+    'Context art',
+    'Crystal Cubism',
+    'Cubism',
+    'Cubo-Futurism',
+    'Cynical realism',
+    'Dada',
+    'Dakar School',
+    'Dansaekhwa',
+    'Danube school',
+    'Dau-al-Set',
+    'De Stijl',
+    'Deconstructivism',
+    'Didacticism',
+    'Digital art',
+    'Early Netherlandish painting',
+    'Ecological Art',
+    'Environmental art',
+    'Excessivism',
+    'Exoticism',
+    'Expressionism',
+    'Fantastic realism',
+    'Fauvism',
+    'Feminist art',
+    'Figuration Libre',
+    'Figurative art',
+    'Fine Art',
+    'Flemish painting',
+    'Fluxus',
+    'Folk art',
+    'Funk art',
+    'Futurism',
+    'Geometric abstract art',
+    'Glitch art',
+    'Gothic art',
+    'Graffiti/Street Art',
+    'Gutai group',
+    'Happening',
+    'Harlem Renaissance',
+    'Heidelberg School',
+    'Hudson River School',
+    'Hurufiyya',
+    'Hypermodernism',
+    'Hyperrealism',
+    'Impressionism',
+    'Incoherents',
+    'Institutional critique',
+    'Interactive Art',
+    'International Gothic',
+    'International Typographic Style',
+    'Japonisme',
+    'Kinetic art',
+    'Kinetic Pointillism',
+    'Kitsch movement',
+    'Land art',
+    'Les Nabis',
+    'Letterism',
+    'Light and Space',
+    'Lowbrow',
+    'Lyco art',
+    'Lyrical abstraction',
+    'Magic realism',
+    'Mail art',
+    'Mannerism',
+    'Massurrealism',
+    'Maximalism',
+    'Metaphysical painting',
+    'Mingei',
+    'Minimalism',
+    'Modern European ink painting',
+    'Modernism',
+    'Modular constructivism',
+    'Naive art',
+    'Neo-Dada',
+    'Neo-expressionism',
+    'Neo-Fauvism',
+    'Neo-figurative',
+    'Neoclassicism',
+    'Neogeo (art)',
+    'Neoism',
+    'Neo-primitivism',
+    'Neo-romanticism',
+    'Net art',
+    'New Objectivity',
+    'New Sculpture',
+    'Northern landscape style',
+    'Northwest School',
+    'Nuclear art',
+    'Nueva Figuración',
+    'Objective abstraction',
+    'Op Art',
+    'Orphism',
+    'Panfuturism',
+    'Paris School',
+    'Patna School of Painting',
+    'Photorealism',
+    'Pixel art',
+    'Plasticien',
+    'Plein Air',
+    'Pointillism',
+    'Pop art',
+    'Post-Impressionism',
+    'Postminimalism',
+    'Precisionism',
+    'Pre-Raphaelitism',
+    'Primitivism',
+    'Private Press',
+    'Process art',
+    'Progressive Art Movement',
+    'Psychedelic art',
+    'Purism',
+    'Qajar art',
+    'Qinglü shanshui',
+    'Quito School',
+    'Rasquache',
+    'Rayonism',
+    'Realism',
+    'Regionalism',
+    'Remodernism',
+    'Renaissance',
+    'Retrofuturism',
+    'Rococo',
+    'Romanesque',
+    'Romanticism',
+    'Samikshavad',
+    'San Ildefonso school',
+    'Serial art',
+    'Shanshui',
+    'Shin hanga',
+    'Shock art',
+    'Site-specific art',
+    'Skeuomorph',
+    'Socialist realism',
+    'Sōsaku hanga',
+    'Sots art',
+    'Southern School',
+    'Space art',
+    'Street art',
+    'Stuckism',
+    'Studio style',
+    'Sumatraism',
+    'Superflat',
+    'Suprematism',
+    'Surrealism',
+    'Symbolism',
+    'Synchromism',
+    'Synthetism',
+    'Tachisme',
+    'Temporary art',
+    'Tonalism',
+    'Toyism',
+    'Transgressive art',
+    'Ukiyo-e',
+    'Underground comix',
+    'Unilalianism',
+    'Vancouver School',
+    'Vanitas',
+    'Verdadism',
+    'Video art',
+    'Viennese Actionism',
+    'Visual Art',
+    'Vorticism',
+    "Women's Art Movement",
+    'Young British Artists',
+    'Young Poland',
+    'Zhe school',
+)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Art Styles Baker
+Reads art_styles.json and writes scripts/_art_styles_data.py, a Python module
+holding the styles as a tuple literal. generate_art.py imports that module so
+it does not have to read and parse the JSON file on every run.
+
+Re-run this script after editing art_styles.json. With --check it only
+verifies that the committed module is up to date, exiting with status 1 if
+it is not.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+ART_STYLES_FILE = REPO_ROOT / "art_styles.json"
+OUTPUT_FILE = SCRIPT_DIR / "_art_styles_data.py"
+
+
+def render_module(art_styles):
+    """Return the source of the baked module for the given art styles."""
+    lines = [
+        "# Generated by scripts/bake_styles.py from art_styles.json; do not edit.",
+        "ART_STYLES = (",
+        *(f"    {style!r}," for style in art_styles),
+        ")",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Bake art_styles.json into a Python module, or check that it is current."""
+    parser = argparse.ArgumentParser(description="Bake art_styles.json into a Python module.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="fail if the baked module does not match art_styles.json instead of rewriting it",
+    )
+    args = parser.parse_args(argv)
+
+    with open(ART_STYLES_FILE, "r", encoding="utf-8") as f:
+        art_styles = json.load(f)["art_styles"]
+    source = render_module(art_styles)
+
+    if args.check:
+        try:
+            current = OUTPUT_FILE.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            current = None
+        if current != source:
+            print(f"ERROR: {OUTPUT_FILE.name} is out of date; run python scripts/bake_styles.py")
+            sys.exit(1)
+        print(f"✓ {OUTPUT_FILE.name} matches art_styles.json")
+        return
+
+    OUTPUT_FILE.write_text(source, encoding="utf-8")
+    print(f"✓ Baked {len(art_styles)} art styles into {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
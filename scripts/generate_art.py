@@ -8,17 +8,27 @@ Note: Image generation requires access to Gemini's Imagen API. If not available,
 the script will still generate and save the art concept prompt to the gist.
 """
 
+import argparse
+import asyncio
 import os
-import sys
-import json
 import random
+import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 import base64
+import binascii
+import contextlib
+import functools
+import hashlib
+import re
+import unicodedata
 
-import google.generativeai as genai
-from github import Github, Auth, InputFileContent
+try:
+    import orjson
+except ImportError:  # fall back to the standard library if orjson is unavailable
+    import json
+    orjson = None
 
 
 # Custom exception for image generation failures
@@ -26,254 +36,858 @@ class ImageGenerationError(Exception):
     """Raised when image generation fails but should not stop the entire process."""
     pass
 
+# Custom exception for gist update failures
+class GistSaveError(Exception):
+    """Raised when the prompt cannot be saved to the gist; main() exits on it."""
+    pass
+
 # Configuration
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-exp")
 GEMINI_IMAGE_MODEL = os.environ.get("GEMINI_IMAGE_MODEL", "gemini-2.5-flash-preview-05-20")
 GIST_TOKEN = os.environ.get("GIST_TOKEN")
 FISH_GIST_ID = os.environ.get("FISH_GIST_ID")
+FISH_GIST_OWNER = os.environ.get("FISH_GIST_OWNER")
+# Number of most recent prompt files kept in the gist; 0 keeps all of them
+MAX_GIST_PROMPTS = int(os.environ.get("MAX_GIST_PROMPTS", "0"))
 SKIP_IMAGE_GENERATION = os.environ.get("SKIP_IMAGE_GENERATION", "false").lower() == "true"
+ENABLE_CONCEPT_CACHE = os.environ.get("ENABLE_CONCEPT_CACHE", "false").lower() == "true"
 
 # Retry configuration for API calls
 MAX_RETRIES = int(os.environ.get("MAX_RETRIES", "3"))
 INITIAL_RETRY_DELAY = float(os.environ.get("INITIAL_RETRY_DELAY", "20.0"))
 MAX_RETRY_DELAY = float(os.environ.get("MAX_RETRY_DELAY", "60.0"))
+MAX_TOTAL_RETRY_SECONDS = float(os.environ.get("MAX_TOTAL_RETRY_SECONDS", "90.0"))
+
+# Upper bound on the art concept length sent on to the image model
+MAX_CONCEPT_CHARS = int(os.environ.get("MAX_CONCEPT_CHARS", "1500"))
+
+# Art styles sent per Gemini request when generating several concepts; larger
+# groups inflate latency more than they save on round trips
+MAX_CONCEPTS_PER_CALL = 16
+
+# Upper bound on concurrent Gemini concept requests; throughput of parallel
+# LLM calls plateaus well before this
+GEMINI_CONCURRENCY = int(os.environ.get("GEMINI_CONCURRENCY", "48"))
+
+# Server-advertised retry delay as it appears in google.rpc.RetryInfo details,
+# a protobuf Duration in JSON form such as "13s" or "1.5s"
+RETRY_DELAY_PATTERN = re.compile(r"(\d+(?:\.\d+)?)s")
+
+# Gist prompt filenames: art_prompt_<UTC timestamp>.md for single runs and
+# art_prompt_<UTC timestamp>_<index>.md for batches
+PROMPT_FILENAME_PATTERN = re.compile(r"art_prompt_(\d{8}_\d{6})(?:_(\d+))?\.md")
+
+# REST endpoints
+GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+GITHUB_API_BASE_URL = "https://api.github.com"
+
+# Idle connections kept open by the shared HTTP client across all hosts
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 8
+
+# Per-request timeouts for network calls, in seconds
+GEMINI_REQUEST_TIMEOUT = float(os.environ.get("GEMINI_REQUEST_TIMEOUT", "60.0"))
+GIST_REQUEST_TIMEOUT = 30.0
+GIST_CONNECT_TIMEOUT = 10.0
+
+# Image output configuration: leading file signature and extension of each
+# accepted image format
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+)
+# Images are base64-decoded and written in chunks of about 256 KiB; the
+# encoded chunk length must be a multiple of 4 to decode independently
+IMAGE_WRITE_CHUNK_SIZE = 256 * 1024
+BASE64_CHUNK_SIZE = 4 * (IMAGE_WRITE_CHUNK_SIZE // 3)
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
 IMAGES_DIR = REPO_ROOT / "images"
 ART_STYLES_FILE = REPO_ROOT / "art_styles.json"
+CONCEPT_CACHE_DIR = REPO_ROOT / ".cache" / "concepts"
+
+# Fixed instructions for art concept generation. They are sent as the model's
+# system instruction so each request only carries the art style itself.
+SYSTEM_PREAMBLE = """You are an expert art director and creative visionary. Generate a highly detailed and evocative art concept prompt for each art style given by the user.
+
+Your prompt should be rich with:
+- Visual details (colors, textures, composition, lighting)
+- Mood and atmosphere
+- Specific artistic techniques characteristic of the art style
+- Subject matter that exemplifies this style
+- Technical specifications (perspective, proportions, medium details)
+
+The prompt should be 150-250 words and be specific enough that an AI image generator can create a high-quality, authentic representation of the art style.
+
+Format each art concept as a single, flowing paragraph without any headers or meta-commentary. Begin directly with the art concept description."""
+
+# Per-request message listing the styles; the instructions above are sent
+# once per request however many styles it carries
+CONCEPT_REQUEST_TEMPLATE = """Art styles:
+{styles}
+
+Return a JSON array of {count} entries in the same order as the numbered art styles, each an object with a "style" key holding the art style name and a "concept" key holding its art concept."""
+
+# Request body parts that are identical for every concept request
+CONCEPT_SYSTEM_INSTRUCTION = {"parts": [{"text": SYSTEM_PREAMBLE}]}
+CONCEPT_GENERATION_CONFIG = {"responseMimeType": "application/json"}
+
+# Lazily created HTTP client, shared by every API call
+_HTTP_CLIENT = None
+
+
+def _get_http_client():
+    """
+    Return the cached HTTP/2 client used for both Gemini and GitHub calls.
+    
+    Its connection pool keeps one connection open per host, so each host's
+    TLS handshake happens once per run however many requests are made. httpx
+    (and its TLS and HTTP/2 stack) is imported here so that runs which exit
+    early, such as on missing configuration or ``--help``, do not pay for it.
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        import httpx
+        _HTTP_CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=GEMINI_REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS),
+        )
+    return _HTTP_CLIENT
+
+
+async def _close_clients():
+    """Close the HTTP client if one was opened during the run."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, indent=False):
+    """Serialize an object to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
 
 
+@functools.lru_cache(maxsize=8)
 def load_json(filepath):
-    """Load JSON content from a file."""
+    """
+    Load JSON content from a file.
+    
+    Results are memoized per path; callers must not mutate the returned data.
+    """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filepath, "rb") as f:
+            return _json_loads(f.read())
     except FileNotFoundError:
         print(f"ERROR: File not found: {filepath}")
         sys.exit(1)
 
 
-def select_random_art_style():
-    """Select a random art style from the art_styles.json file."""
+@functools.lru_cache(maxsize=None)
+def load_art_styles():
+    """
+    Load the art styles as a tuple, parsing art_styles.json only once.
+    
+    Prefers the constant baked by bake_styles.py and falls back to reading
+    the JSON file when the baked module is missing.
+    """
+    try:
+        from _art_styles_data import ART_STYLES
+    except ImportError:
+        ART_STYLES = None
+    if ART_STYLES:
+        return ART_STYLES
+
     art_data = load_json(ART_STYLES_FILE)
     if not art_data or "art_styles" not in art_data:
         print("ERROR: Could not load art styles from art_styles.json")
         sys.exit(1)
     
-    art_styles = art_data["art_styles"]
+    art_styles = tuple(art_data["art_styles"])
     if not art_styles:
         print("ERROR: Art styles list is empty")
         sys.exit(1)
-    
+    return art_styles
+
+
+def select_random_art_style():
+    """Select a random art style from the configured art styles."""
+    art_styles = load_art_styles()
     selected = random.choice(art_styles)
     print(f"Selected art style: {selected}")
     return selected
 
 
-def generate_art_concept(art_style):
+def select_random_art_styles(count):
+    """Select up to ``count`` distinct random art styles."""
+    art_styles = load_art_styles()
+    selected = random.sample(art_styles, min(count, len(art_styles)))
+    print(f"Selected art styles: {', '.join(selected)}")
+    return selected
+
+
+def _cap(text, limit):
+    """Truncate text to at most ``limit`` characters, preferring a sentence end."""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(".", 0, limit)
+    return text[:cut + 1] if cut > limit // 2 else text[:limit]
+
+
+def _concept_cache_path(prompt):
+    """Return the on-disk cache path for a (model, prompt) pair."""
+    key = hashlib.blake2b(
+        f"{GEMINI_MODEL}\0{SYSTEM_PREAMBLE}\0{prompt}".encode("utf-8"), digest_size=16
+    )
+    return CONCEPT_CACHE_DIR / f"{key.hexdigest()}.txt"
+
+
+def _read_cached_concept(prompt):
+    """Return the cached concept for a prompt, or None on a cache miss."""
+    try:
+        return _concept_cache_path(prompt).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _write_cached_concept(prompt, concept):
+    """Atomically store a generated concept in the on-disk cache."""
+    import tempfile
+    
+    cache_path = _concept_cache_path(prompt)
+    CONCEPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CONCEPT_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(concept)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"WARNING: Could not write concept cache: {e}")
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+async def _generate_content(model, payload):
     """
-    Generate a detailed art concept prompt using Gemini AI.
+    Call the Gemini generateContent REST endpoint.
     
     Args:
-        art_style: The art style to generate a concept for
+        model: Name of the Gemini model
+        payload: Request body for generateContent
     
     Returns:
-        str: Detailed art concept prompt
+        dict: Decoded response body
+    
+    Raises:
+        httpx.HTTPStatusError: If the API returns an error status
     """
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        
-        prompt = f"""You are an expert art director and creative visionary. Generate a highly detailed and evocative art concept prompt in the style of "{art_style}".
+    response = await _get_http_client().post(
+        f"{GEMINI_API_BASE_URL}/models/{model}:generateContent",
+        content=_json_dumps(payload),
+        headers={
+            "Content-Type": "application/json",
+            "x-goog-api-key": GEMINI_API_KEY,
+        },
+    )
+    response.raise_for_status()
+    return _json_loads(response.content)
+
+
+def _response_text(response):
+    """Return the concatenated text parts of the first response candidate."""
+    parts = response["candidates"][0]["content"]["parts"]
+    return "".join(part.get("text", "") for part in parts)
 
-Your prompt should be rich with:
-- Visual details (colors, textures, composition, lighting)
-- Mood and atmosphere
-- Specific artistic techniques characteristic of {art_style}
-- Subject matter that exemplifies this style
-- Technical specifications (perspective, proportions, medium details)
 
-The prompt should be 150-250 words and be specific enough that an AI image generator can create a high-quality, authentic representation of {art_style}.
+def _normalize_style(name):
+    """Fold case, accents and punctuation so echoed style names compare equal."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(re.findall(r"\w+", stripped.casefold()))
 
-Format your response as a single, flowing paragraph without any headers or meta-commentary. Begin directly with the art concept description."""
 
-        print(f"Generating art concept for {art_style}...")
-        response = model.generate_content(prompt)
+async def _request_art_concepts(art_styles):
+    """
+    Generate art concepts for several styles with a single Gemini call.
+    
+    Args:
+        art_styles: The art styles to generate concepts for
+    
+    Returns:
+        list: One art concept per style, in input order
+    
+    Raises:
+        ValueError: If the response does not hold exactly one concept per style
+    """
+    prompt = CONCEPT_REQUEST_TEMPLATE.format(
+        styles="\n".join(f"{i}. {art_style}" for i, art_style in enumerate(art_styles, 1)),
+        count=len(art_styles),
+    )
+    
+    print(f"Generating art concepts for {', '.join(art_styles)}...")
+    response = await _generate_content(GEMINI_MODEL, {
+        "systemInstruction": CONCEPT_SYSTEM_INSTRUCTION,
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": CONCEPT_GENERATION_CONFIG,
+    })
+    
+    text = _response_text(response)
+    entries = _json_loads(text)
+    if not isinstance(entries, list) or len(entries) != len(art_styles):
+        raise ValueError(
+            f"Expected {len(art_styles)} art concepts, got: {text[:200]}"
+        )
+    # Match concepts to styles by the returned style name so reordered
+    # entries are not mislabeled. A style whose name the model reworded takes
+    # the entry at its own position, unless that entry names another
+    # requested style (a merged or duplicated entry).
+    keys = [_normalize_style(art_style) for art_style in art_styles]
+    entry_keys = [_normalize_style(str(entry.get("style", ""))) for entry in entries]
+    by_name = {}
+    for entry_key, entry in zip(entry_keys, entries):
+        by_name.setdefault(entry_key, entry)
+    
+    concepts = []
+    missing = []
+    for art_style, key, entry_key, entry in zip(art_styles, keys, entry_keys, entries):
+        if key in by_name:
+            concepts.append(by_name[key]["concept"])
+        elif entry_key not in keys:
+            concepts.append(entry["concept"])
+        else:
+            missing.append(art_style)
+    if missing:
+        raise ValueError(
+            f"No art concept returned for {', '.join(missing)}, got: {text[:200]}"
+        )
+    return [_cap(concept.strip(), MAX_CONCEPT_CHARS) for concept in concepts]
+
+
+async def _request_art_concepts_with_retry(art_styles, semaphore):
+    """
+    Generate art concepts for one group of styles, retrying transient failures.
+    
+    Rate limits and malformed responses are retried like image requests, up
+    to MAX_RETRIES attempts within MAX_TOTAL_RETRY_SECONDS. The semaphore is
+    released while waiting so other groups can use the slot.
+    
+    Args:
+        art_styles: The art styles to generate concepts for
+        semaphore: Semaphore bounding concurrent Gemini requests
+    
+    Returns:
+        list: One art concept per style, in input order
+    """
+    start = time.monotonic()
+    for attempt in range(MAX_RETRIES):
+        try:
+            async with semaphore:
+                return await _request_art_concepts(art_styles)
+        except Exception as e:
+            is_rate_limit = _is_rate_limit_error(e)
+            # A response that does not parse or match the styles may be fine
+            # on another attempt
+            is_malformed = isinstance(e, (ValueError, KeyError))
+            if not (is_rate_limit or is_malformed) or attempt == MAX_RETRIES - 1:
+                raise
+            delay = _retry_delay(e, attempt)
+            reason = "Rate limit hit" if is_rate_limit else "Malformed art concept response"
+            if time.monotonic() - start + delay > MAX_TOTAL_RETRY_SECONDS:
+                print(f"{reason} (attempt {attempt + 1}/{MAX_RETRIES}). Retry budget of {MAX_TOTAL_RETRY_SECONDS:.0f} seconds exhausted.")
+                raise
+            print(f"{reason} (attempt {attempt + 1}/{MAX_RETRIES}). Retrying in {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
+
+
+async def generate_art_concepts(art_styles):
+    """
+    Generate detailed art concept prompts for several art styles using Gemini AI.
+    
+    Styles are sent in groups of up to MAX_CONCEPTS_PER_CALL per request so
+    the shared instructions and round trip are paid once per group; groups
+    are requested concurrently, at most GEMINI_CONCURRENCY at a time, and
+    each group is retried on rate limits.
+    
+    Args:
+        art_styles: The art styles to generate concepts for
+    
+    Returns:
+        list: Detailed art concept prompts, in input order
+    """
+    try:
+        concepts = {}
+        pending = []
+        for art_style in dict.fromkeys(art_styles):
+            if ENABLE_CONCEPT_CACHE:
+                cached = _read_cached_concept(f"Art style: {art_style}")
+                if cached is not None:
+                    print(f"Using cached art concept for {art_style}")
+                    concepts[art_style] = cached
+                    continue
+            pending.append(art_style)
         
-        return response.text.strip()
+        groups = [
+            pending[i:i + MAX_CONCEPTS_PER_CALL]
+            for i in range(0, len(pending), MAX_CONCEPTS_PER_CALL)
+        ]
+        semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+        results = await asyncio.gather(*(
+            _request_art_concepts_with_retry(group, semaphore) for group in groups
+        ))
+        for group, group_concepts in zip(groups, results):
+            for art_style, concept in zip(group, group_concepts):
+                concepts[art_style] = concept
+                if ENABLE_CONCEPT_CACHE:
+                    _write_cached_concept(f"Art style: {art_style}", concept)
+        
+        return [concepts[art_style] for art_style in art_styles]
     except Exception as e:
         print(f"ERROR: Failed to generate art concept: {e}")
         sys.exit(1)
 
 
-def save_prompt_to_gist(art_style, art_concept):
+async def generate_art_concept(art_style):
+    """
+    Generate a detailed art concept prompt using Gemini AI.
+    
+    Args:
+        art_style: The art style to generate a concept for
+    
+    Returns:
+        str: Detailed art concept prompt
+    """
+    concepts = await generate_art_concepts([art_style])
+    return concepts[0]
+
+
+def _render_prompt_markdown(art_style, art_concept, now_utc):
+    """
+    Render the markdown document stored in the gist for one art concept.
+    
+    Args:
+        art_style: The art style name
+        art_concept: The detailed art concept prompt
+        now_utc: UTC time the concept was generated
+    
+    Returns:
+        str: Markdown content for the gist file
+    """
+    parts = [
+        "# Art Concept: ", art_style,
+        "\n\n**Generated:** ", now_utc.strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "\n\n**Art Style:** ", art_style,
+        "\n\n## Art Concept Prompt\n\n", art_concept,
+        "\n\n---\n\n*This prompt was generated using Gemini AI and is used to create AI-generated artwork.*\n",
+    ]
+    return "".join(parts)
+
+
+def _require_gist_credentials():
+    """Raise GistSaveError if the gist credentials are not configured."""
+    if not GIST_TOKEN:
+        raise GistSaveError("GIST_TOKEN environment variable is not set")
+    if not FISH_GIST_ID:
+        raise GistSaveError("FISH_GIST_ID environment variable is not set")
+
+
+async def _patch_gist(files):
+    """
+    Send a PATCH request for the gist's files.
+    
+    Args:
+        files: Mapping of gist filename to its new file object, or None to
+            delete the file
+    
+    Returns:
+        httpx.Response: The successful API response
+    
+    Raises:
+        GistSaveError: If the gist does not exist
+        httpx.HTTPStatusError: If the API returns any other error status
+    """
+    import httpx
+    response = await _get_http_client().patch(
+        f"{GITHUB_API_BASE_URL}/gists/{FISH_GIST_ID}",
+        content=_json_dumps({"files": files}),
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {GIST_TOKEN}",
+            "Accept": "application/vnd.github+json",
+        },
+        timeout=httpx.Timeout(GIST_REQUEST_TIMEOUT, connect=GIST_CONNECT_TIMEOUT),
+    )
+    if response.status_code == 404:
+        raise GistSaveError(f"Could not access gist {FISH_GIST_ID}: not found")
+    response.raise_for_status()
+    return response
+
+
+def _prompt_sort_key(match):
+    """Order prompt filenames by UTC timestamp, then by batch index."""
+    timestamp, index = match.groups()
+    return timestamp, int(index) if index is not None else -1
+
+
+async def _prune_gist_prompts(filenames, saved):
+    """
+    Delete the oldest prompt files so at most MAX_GIST_PROMPTS remain.
+    
+    Prompt filenames embed their UTC timestamp and batch index, which order
+    them by age. Files written by the current update are never deleted, even
+    when there are more of them than MAX_GIST_PROMPTS. Pruning is best
+    effort: it runs after the new prompts are saved, so a failure only
+    prints a warning.
+    
+    Args:
+        filenames: Names of all files currently in the gist
+        saved: Names of the files written by the current update
+    """
+    matches = sorted(
+        filter(None, (PROMPT_FILENAME_PATTERN.fullmatch(name) for name in filenames)),
+        key=_prompt_sort_key,
+    )
+    excess = [
+        match.group(0) for match in matches[:-MAX_GIST_PROMPTS]
+        if match.group(0) not in saved
+    ]
+    if excess:
+        print(f"Removing {len(excess)} oldest prompts from gist (MAX_GIST_PROMPTS={MAX_GIST_PROMPTS})...")
+        try:
+            await _patch_gist({name: None for name in excess})
+        except Exception as e:
+            print(f"WARNING: Could not remove old prompts from gist: {e}")
+
+
+async def _update_gist_files(files):
+    """
+    Add or replace files in the gist with a single PATCH request.
+    
+    No prior GET of the gist is needed. The owner login is taken from
+    FISH_GIST_OWNER when set, otherwise from the response, which carries the
+    whole gist and so grows with every saved prompt unless MAX_GIST_PROMPTS
+    bounds it.
+    
+    Args:
+        files: Mapping of gist filename to markdown content
+    
+    Returns:
+        str: Login of the gist owner
+    """
+    response = await _patch_gist(
+        {name: {"content": content} for name, content in files.items()}
+    )
+    gist = None
+    if MAX_GIST_PROMPTS > 0:
+        gist = _json_loads(response.content)
+        await _prune_gist_prompts(gist["files"], files)
+    if FISH_GIST_OWNER:
+        return FISH_GIST_OWNER
+    if gist is None:
+        gist = _json_loads(response.content)
+    return gist["owner"]["login"]
+
+
+async def save_prompt_to_gist(art_style, art_concept, now_utc):
     """
     Save the art concept prompt to a public GitHub Gist.
     
     Args:
         art_style: The art style name
         art_concept: The detailed art concept prompt
+        now_utc: UTC time of the run, used for the filename and header
     
     Returns:
         str: URL to the gist
+    
+    Raises:
+        GistSaveError: If the prompt could not be saved
     """
     try:
         # Validate credentials
-        if not GIST_TOKEN:
-            print("ERROR: GIST_TOKEN environment variable is not set")
-            sys.exit(1)
-        if not FISH_GIST_ID:
-            print("ERROR: FISH_GIST_ID environment variable is not set")
-            sys.exit(1)
-        
-        # Connect to GitHub
-        g = Github(auth=Auth.Token(GIST_TOKEN))
-        user = g.get_user()
-        
-        # Get or create gist
-        try:
-            gist = g.get_gist(FISH_GIST_ID)
-            print(f"Found existing gist: {FISH_GIST_ID}")
-        except Exception as e:
-            print(f"ERROR: Could not access gist {FISH_GIST_ID}: {e}")
-            sys.exit(1)
+        _require_gist_credentials()
         
         # Create filename with timestamp (UTC)
-        now_utc = datetime.now(timezone.utc)
         timestamp = now_utc.strftime("%Y%m%d_%H%M%S")
         filename = f"art_prompt_{timestamp}.md"
         
         # Create markdown content
-        content = f"""# Art Concept: {art_style}
-
-**Generated:** {now_utc.strftime("%Y-%m-%d %H:%M:%S UTC")}
-
-**Art Style:** {art_style}
-
-## Art Concept Prompt
-
-{art_concept}
-
----
-
-*This prompt was generated using Gemini AI and is used to create AI-generated artwork.*
-"""
+        content = _render_prompt_markdown(art_style, art_concept, now_utc)
         
         # Update gist
         print(f"Saving prompt to gist as {filename}...")
-        files = {filename: InputFileContent(content)}
-        gist.edit(files=files)
-        
-        gist_url = f"https://gist.github.com/{user.login}/{FISH_GIST_ID}#{filename}"
+        owner = await _update_gist_files({filename: content})
+        gist_url = f"https://gist.github.com/{owner}/{FISH_GIST_ID}#{filename}"
         print(f"✓ Prompt saved to gist: {gist_url}")
         
         return gist_url
+    except GistSaveError:
+        raise
     except Exception as e:
-        print(f"ERROR: Failed to save prompt to gist: {e}")
-        sys.exit(1)
+        raise GistSaveError(f"Failed to save prompt to gist: {e}") from e
+
+
+async def save_prompts_to_gist_batch(items, now_utc):
+    """
+    Save several art concept prompts to the gist in one update.
+    
+    Args:
+        items: List of (art_style, art_concept) pairs
+        now_utc: UTC time of the run, used for the filenames and headers
+    
+    Returns:
+        list: URL to each saved prompt in the gist, in input order
+    
+    Raises:
+        GistSaveError: If the prompts could not be saved
+    """
+    try:
+        # Validate credentials
+        _require_gist_credentials()
+        
+        timestamp = now_utc.strftime("%Y%m%d_%H%M%S")
+        files = {
+            f"art_prompt_{timestamp}_{i}.md": _render_prompt_markdown(art_style, art_concept, now_utc)
+            for i, (art_style, art_concept) in enumerate(items)
+        }
+        
+        print(f"Saving {len(files)} prompts to gist...")
+        owner = await _update_gist_files(files)
+        gist_urls = [
+            f"https://gist.github.com/{owner}/{FISH_GIST_ID}#{filename}"
+            for filename in files
+        ]
+        print(f"✓ {len(gist_urls)} prompts saved to gist")
+        
+        return gist_urls
+    except GistSaveError:
+        raise
+    except Exception as e:
+        raise GistSaveError(f"Failed to save prompts to gist: {e}") from e
+
+
+@contextlib.contextmanager
+def _atomic_open(path, buffering=-1):
+    """
+    Open a temporary file for binary writing and move it over ``path`` on success.
+    
+    Readers always see either the previous file or the complete new one; a
+    write interrupted part way leaves only the ``.tmp`` file behind, which is
+    removed when the failure is an exception.
+    """
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(tmp_path, "wb", buffering=buffering) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _image_extension(image_data):
+    """
+    Return the file extension matching the signature of the image data.
+    
+    Only the first few base64 characters are decoded for the check.
+    
+    Args:
+        image_data: Base64-encoded image returned by the image model
+    
+    Returns:
+        str: ``.png`` or ``.jpg``, or None if the data is not a supported image
+    """
+    try:
+        head = base64.b64decode(image_data[:16], validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    for signature, extension in IMAGE_SIGNATURES:
+        if head[:len(signature)] == signature:
+            return extension
+    return None
+
+
+def _write_image(image_path, image_data):
+    """
+    Decode a base64 image and write it to disk in fixed-size chunks.
+    
+    Only one decoded chunk is held in memory at a time rather than the
+    whole image.
+    
+    Args:
+        image_path: Destination path for the image
+        image_data: Base64-encoded image returned by the image model
+    """
+    with _atomic_open(image_path, buffering=1024 * 1024) as f:
+        for offset in range(0, len(image_data), BASE64_CHUNK_SIZE):
+            f.write(base64.b64decode(image_data[offset:offset + BASE64_CHUNK_SIZE]))
 
 
-def generate_image(art_concept, art_style):
+def _iter_inline_datas(response):
+    """
+    Yield the base64-encoded inline image payloads of an image model response.
+    
+    Parts are read from every candidate; candidates without content (for
+    example when blocked by safety filters) are skipped. Payloads are left
+    encoded so they can be decoded chunk by chunk while writing.
+    """
+    for candidate in response.get("candidates", ()):
+        for part in candidate.get("content", {}).get("parts", ()):
+            inline_data = part.get("inlineData")
+            if inline_data:
+                yield inline_data.get("data", "")
+
+
+def _retry_delay_hint(error):
+    """
+    Return the retry delay advertised by the server for an API error.
+    
+    The ``Retry-After`` header is used when present, otherwise the
+    ``google.rpc.RetryInfo`` entry in the JSON error details.
+    
+    Args:
+        error: Exception raised while calling the Gemini API
+    
+    Returns:
+        float: Seconds to wait before retrying, or None if no hint is present
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        details = _json_loads(response.content)["error"]["details"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    for detail in details:
+        if detail.get("@type", "").endswith("google.rpc.RetryInfo"):
+            match = RETRY_DELAY_PATTERN.fullmatch(detail.get("retryDelay", ""))
+            if match:
+                return float(match.group(1))
+    return None
+
+
+def _is_rate_limit_error(error):
+    """
+    Return True if an API error is a rate limit that is worth retrying.
+    
+    Detected by HTTP status code 429, exception type, or error message content.
+    """
+    error_str = str(error)
+    return (
+        "429" in error_str or 
+        "ResourceExhausted" in type(error).__name__ or 
+        "quota" in error_str.lower() or
+        "rate" in error_str.lower() and "limit" in error_str.lower()
+    )
+
+
+def _retry_delay(error, attempt):
+    """
+    Return the number of seconds to wait before retrying a failed API call.
+    
+    Honors the server's retry hint when present, otherwise falls back to
+    exponential backoff capped at MAX_RETRY_DELAY.
+    
+    Args:
+        error: Exception raised by the failed attempt
+        attempt: Zero-based number of the failed attempt
+    
+    Returns:
+        float: Seconds to wait
+    """
+    server_hint = _retry_delay_hint(error)
+    if server_hint is not None:
+        return max(server_hint, 1)
+    return min(INITIAL_RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
+
+
+async def generate_image(art_concept, art_style, now_utc):
     """
     Generate an image using Gemini's Imagen API based on the art concept prompt.
     
     Note: This uses the Imagen API through Gemini's generative model.
     The model is configured via GEMINI_IMAGE_MODEL environment variable.
-    Includes retry logic with exponential backoff for rate limit errors.
+    Includes retry logic with exponential backoff for rate limit errors and
+    responses that carry no valid PNG or JPEG image.
     
     Args:
         art_concept: The detailed art concept prompt
         art_style: The art style name (for filename)
+        now_utc: UTC time of the run, used for the image filename
     
     Returns:
         str: Path to the saved image file
     """
-    genai.configure(api_key=GEMINI_API_KEY)
-    
     # Use Imagen model for image generation
     print(f"Generating image for {art_style}...")
     print(f"Using prompt: {art_concept[:100]}...")
     print(f"Using image model: {GEMINI_IMAGE_MODEL}")
     
-    # Use the image model from environment variable
-    imagen_model = genai.GenerativeModel(GEMINI_IMAGE_MODEL)
-    
-    # Prepare image path with consistent timestamp (outside retry loop)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-    image_filename = f"{timestamp}.png"
-    image_path = IMAGES_DIR / image_filename
-    
-    # Ensure images directory exists
-    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    # Prepare image filename with consistent timestamp (outside retry loop);
+    # the extension follows the format of the returned image
+    timestamp = now_utc.strftime("%Y%m%d%H%M%S")
     
     last_exception = None
+    start = time.monotonic()
     
     for attempt in range(MAX_RETRIES):
         try:
             # Generate image with the art concept prompt
-            response = imagen_model.generate_content(art_concept)
+            response = await _generate_content(GEMINI_IMAGE_MODEL, {
+                "contents": [{"parts": [{"text": art_concept}]}],
+            })
             
             # Extract image data from response
-            # The response should contain image data in parts
-            if response and hasattr(response, 'parts'):
-                for part in response.parts:
-                    if hasattr(part, 'inline_data'):
-                        # Validate image data before writing
-                        image_data = part.inline_data.data
-                        if image_data and len(image_data) > 0:
-                            with open(image_path, "wb") as f:
-                                f.write(image_data)
-                            print(f"✓ Image saved to {image_path}")
-                            return str(image_path)
-                        else:
-                            print("WARNING: Image data is empty or None")
-            
-            # If we reach here, try alternative format
-            if hasattr(response, '_result'):
-                result = response._result
-                if hasattr(result, 'candidates') and result.candidates:
-                    candidate = result.candidates[0]
-                    if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
-                        for part in candidate.content.parts:
-                            if hasattr(part, 'inline_data'):
-                                # Validate image data before writing
-                                image_data = part.inline_data.data
-                                if image_data and len(image_data) > 0:
-                                    with open(image_path, "wb") as f:
-                                        f.write(image_data)
-                                    print(f"✓ Image saved to {image_path}")
-                                    return str(image_path)
-                                else:
-                                    print("WARNING: Image data is empty or None")
+            for image_data in _iter_inline_datas(response):
+                # Validate image data before writing
+                extension = _image_extension(image_data)
+                if extension is None:
+                    print("WARNING: Image data is empty or not a PNG/JPEG image")
+                    continue
+                image_path = IMAGES_DIR / f"{timestamp}{extension}"
+                _write_image(image_path, image_data)
+                print(f"✓ Image saved to {image_path}")
+                return str(image_path)
             
             print("ERROR: Could not extract image data from response")
             raise ImageGenerationError("No valid image data found in response")
             
         except Exception as e:
             last_exception = e
-            error_str = str(e)
-            error_type = type(e).__name__
             
             # Check if this is a rate limit error that can be retried
-            # Detect by HTTP status code 429, exception type, or error message content
-            is_rate_limit = (
-                "429" in error_str or 
-                "ResourceExhausted" in error_type or 
-                "quota" in error_str.lower() or
-                "rate" in error_str.lower() and "limit" in error_str.lower()
-            )
+            is_rate_limit = _is_rate_limit_error(e)
+            
+            # A response without a usable image is also worth another attempt
+            is_invalid_image = isinstance(e, ImageGenerationError)
+            reason = "Rate limit hit" if is_rate_limit else "No valid image in response"
             
-            if is_rate_limit and attempt < MAX_RETRIES - 1:
-                # Calculate delay with exponential backoff, capped at MAX_RETRY_DELAY
-                delay = min(INITIAL_RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
-                print(f"Rate limit hit (attempt {attempt + 1}/{MAX_RETRIES}). Retrying in {delay:.1f} seconds...")
-                time.sleep(delay)
+            if (is_rate_limit or is_invalid_image) and attempt < MAX_RETRIES - 1:
+                delay = _retry_delay(e, attempt)
+                if time.monotonic() - start + delay > MAX_TOTAL_RETRY_SECONDS:
+                    print(f"{reason} (attempt {attempt + 1}/{MAX_RETRIES}). Retry budget of {MAX_TOTAL_RETRY_SECONDS:.0f} seconds exhausted.")
+                    break
+                print(f"{reason} (attempt {attempt + 1}/{MAX_RETRIES}). Retrying in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
                 continue
             else:
-                # Either not a rate limit error or we've exhausted retries
+                # Either not a retryable error or we've exhausted retries
                 break
     
     # If we get here, all retries failed
@@ -282,7 +896,7 @@ def generate_image(art_concept, art_style):
     print(f"\nNote: Image generation with Gemini requires:")
     print(f"  1. Access to Imagen API (configured model: {GEMINI_IMAGE_MODEL})")
     print(f"  2. Proper API key with image generation permissions")
-    print(f"  3. Updated google-generativeai library (>=0.8.0)")
+    print(f"  3. An image-capable model served by the Gemini API")
     print(f"\nThe art concept prompt has been saved to the gist.")
     print(f"You can use it with other image generation tools:")
     print(f"  - DALL-E (OpenAI)")
@@ -292,7 +906,7 @@ def generate_image(art_concept, art_style):
     raise ImageGenerationError(f"Image generation failed: {last_exception}")
 
 
-def create_metadata_file(art_style, art_concept, gist_url, image_path):
+async def create_metadata_file(art_style, art_concept, gist_url, image_path, now_utc):
     """
     Create a metadata JSON file with generation details.
     
@@ -301,26 +915,115 @@ def create_metadata_file(art_style, art_concept, gist_url, image_path):
         art_concept: The art concept prompt
         gist_url: URL to the gist containing the prompt
         image_path: Path to the generated image
+        now_utc: UTC time the image was generated
     """
     metadata = {
         "art_style": art_style,
         "art_concept": art_concept,
         "gist_url": gist_url,
         "image_file": Path(image_path).name,
-        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "generated_at": now_utc.isoformat(timespec="seconds"),
         "gemini_model": GEMINI_MODEL
     }
     
     metadata_filename = Path(image_path).stem + "_metadata.json"
     metadata_path = IMAGES_DIR / metadata_filename
     
-    with open(metadata_path, "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2)
+    with _atomic_open(metadata_path) as f:
+        f.write(_json_dumps(metadata, indent=True))
     
     print(f"✓ Metadata saved to {metadata_path}")
 
 
-def main():
+async def generate_image_with_metadata(art_style, art_concept, gist_task, now_utc):
+    """
+    Generate the image and, once the gist URL is known, its metadata file.
+    
+    Args:
+        art_style: The art style name
+        art_concept: The detailed art concept prompt
+        gist_task: Task resolving to the gist URL for the prompt
+        now_utc: UTC time of the run, used for the filename and metadata
+    
+    Returns:
+        str: Path to the saved image file, or None if generation failed
+    """
+    try:
+        image_path = await generate_image(art_concept, art_style, now_utc)
+        print(f"  Image saved: {image_path}")
+        
+        # Create metadata file. Without a saved prompt the image would be
+        # left without metadata, so it is removed if the gist upload fails.
+        try:
+            gist_url = await gist_task
+        except BaseException:
+            Path(image_path).unlink(missing_ok=True)
+            raise
+        await create_metadata_file(art_style, art_concept, gist_url, image_path, now_utc)
+        return image_path
+    except ImageGenerationError as e:
+        print(f"\n⚠️  Image generation failed: {e}")
+        print("  The art concept has been saved to the gist and can be used")
+        print("  with other image generation tools.")
+        return None
+
+
+async def run_batch(batch_size, now_utc):
+    """
+    Generate several art concepts concurrently and save them in one gist update.
+    
+    Images are not generated in batch mode.
+    
+    Args:
+        batch_size: Number of art concepts to generate
+        now_utc: UTC time of the run, used for the gist filenames
+    """
+    # Step 1: Select distinct random art styles
+    art_styles = select_random_art_styles(batch_size)
+    print(f"\n[1/3] Selected {len(art_styles)} art styles")
+    
+    # Step 2: Generate all art concepts with batched Gemini requests
+    art_concepts = await generate_art_concepts(art_styles)
+    print(f"\n[2/3] Generated {len(art_concepts)} art concepts")
+    
+    # Step 3: Save every prompt with a single gist update
+    gist_urls = await save_prompts_to_gist_batch(list(zip(art_styles, art_concepts)), now_utc)
+    print(f"\n[3/3] Saved {len(gist_urls)} prompts to gist")
+    await _close_clients()
+    
+    print("\n" + "=" * 60)
+    print("✓ Batch art generation complete!")
+    for art_style, gist_url in zip(art_styles, gist_urls):
+        print(f"  {art_style}: {gist_url}")
+    print("=" * 60)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate AI art from a random art style.")
+    parser.add_argument(
+        "--mode",
+        choices=("image", "prompt-only"),
+        help="generate the image too, or only the prompt "
+             "(default: image, or prompt-only with --batch or when SKIP_IMAGE_GENERATION=true)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        metavar="N",
+        help="generate N art concepts and save them in one gist update (no images)",
+    )
+    args = parser.parse_args(argv)
+    if args.batch is not None and args.batch < 1:
+        parser.error("--batch must be at least 1")
+    if args.batch is not None and args.mode == "image":
+        parser.error("--batch only generates prompts; it cannot be combined with --mode image")
+    if args.mode is None:
+        args.mode = "prompt-only" if args.batch is not None or SKIP_IMAGE_GENERATION else "image"
+    return args
+
+
+async def main(args):
     """Main execution function."""
     print("=" * 60)
     print("Art Style Image Generator")
@@ -331,37 +1034,58 @@ def main():
         print("ERROR: GEMINI_API_KEY environment variable is not set")
         sys.exit(1)
     
+    # One timestamp for the whole run keeps the gist file, image filename and
+    # metadata in agreement
+    now_utc = datetime.now(timezone.utc)
+    
+    if args.batch:
+        try:
+            await run_batch(args.batch, now_utc)
+        except GistSaveError as e:
+            print(f"ERROR: {e}")
+            await _close_clients()
+            sys.exit(1)
+        return
+    
     # Step 1: Select random art style
     art_style = select_random_art_style()
     print(f"\n[1/4] Selected art style: {art_style}")
     
     # Step 2: Generate detailed art concept
-    art_concept = generate_art_concept(art_style)
+    concept_task = asyncio.create_task(generate_art_concept(art_style))
+    art_concept = await concept_task
     print(f"\n[2/4] Generated art concept:")
     print(f"  {art_concept[:150]}...")
     
-    # Step 3: Save prompt to gist
-    gist_url = save_prompt_to_gist(art_style, art_concept)
-    print(f"\n[3/4] Saved to gist: {gist_url}")
-    
-    # Step 4: Generate image (optional based on configuration)
+    # Steps 3 and 4 only depend on the concept, so the gist upload and the
+    # image generation run concurrently
+    gist_task = asyncio.create_task(save_prompt_to_gist(art_style, art_concept, now_utc))
+    print(f"\n[3/4] Saving prompt to gist...")
     image_path = None
-    if SKIP_IMAGE_GENERATION:
-        print(f"\n[4/4] Skipping image generation (SKIP_IMAGE_GENERATION=true)")
-        print("  Note: Image generation requires Imagen API access")
-    else:
-        print(f"\n[4/4] Generating image...")
-        try:
-            image_path = generate_image(art_concept, art_style)
-            print(f"  Image saved: {image_path}")
-            
-            # Create metadata file
-            create_metadata_file(art_style, art_concept, gist_url, image_path)
-        except ImageGenerationError as e:
-            print(f"\n⚠️  Image generation failed: {e}")
-            print("  The art concept has been saved to the gist and can be used")
-            print("  with other image generation tools.")
-            image_path = None
+    image_task = None
+    try:
+        if args.mode == "prompt-only":
+            print(f"\n[4/4] Skipping image generation (--mode prompt-only)")
+            print("  Note: Image generation requires Imagen API access")
+            gist_url = await gist_task
+        else:
+            print(f"\n[4/4] Generating image...")
+            # Ensure images directory exists
+            IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+            image_task = asyncio.create_task(
+                generate_image_with_metadata(art_style, art_concept, gist_task, now_utc)
+            )
+            gist_url, image_path = await asyncio.gather(gist_task, image_task)
+    except GistSaveError as e:
+        print(f"ERROR: {e}")
+        # The image is of no use without its prompt; stop it before exiting
+        if image_task is not None:
+            image_task.cancel()
+            await asyncio.gather(image_task, return_exceptions=True)
+        await _close_clients()
+        sys.exit(1)
+    await _close_clients()
+    print(f"\n  Saved to gist: {gist_url}")
     
     print("\n" + "=" * 60)
     print("✓ Art generation complete!")
@@ -379,4 +1103,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main(parse_args()))